@@ -4,19 +4,131 @@ Multi-API Event Simulator
 Generates mock Salesforce and MuleSoft events and sends them to Azure Function App
 """
 
+import asyncio
 import json
 import time
 import random
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Dict, List
-import uuid
+import os
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # async transport is optional; thread pool path still works
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # pools fall back to stdlib random batch draws
+
+# Weighted draw tables shared by the per-event generators and the pools
+_SF_STATUS_CODES = (200, 201, 400, 401, 403, 404, 500)
+_SF_STATUS_WEIGHTS = (60, 15, 10, 5, 3, 4, 3)
+_MS_STATUS_CODES = (200, 201, 202)
+_MS_STATUS_WEIGHTS = (80, 15, 5)
+
+_POOL_SIZE = 256
+
+# Millisecond-resolution timestamp cache: events generated within the
+# same millisecond share one formatted string instead of re-running
+# datetime.utcnow().isoformat() each
+_TS_CACHE = [0, ""]
+
+def _utcnow_iso() -> str:
+    """Current UTC time as an ISO-8601 string, cached per millisecond."""
+    ms = int(time.time() * 1000)
+    if ms != _TS_CACHE[0]:
+        _TS_CACHE[0] = ms
+        _TS_CACHE[1] = datetime.utcfromtimestamp(ms / 1000).isoformat(
+            timespec='milliseconds') + 'Z'
+    return _TS_CACHE[1]
+
+def _uuid_batch(n: int) -> List[str]:
+    """Format n RFC-4122 v4 UUID strings from a single os.urandom read.
+
+    uuid.uuid4() allocates and validates a UUID object per call; reading
+    16*n random bytes at once and slicing the hex is much cheaper.
+    """
+    buf = os.urandom(16 * n)
+    out = []
+    for i in range(0, 16 * n, 16):
+        b = bytearray(buf[i:i + 16])
+        b[6] = (b[6] & 0x0F) | 0x40  # version 4
+        b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+        h = b.hex()
+        out.append(f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+    return out
+
+# Full-shape event templates: .copy() yields a dict whose hash table is
+# already sized for every key, with the constant-valued fields pre-filled,
+# so generators never trigger a mid-build resize or rebuild the literals
+_SF_LOGIN_TMPL = {
+    "eventType": "Login", "sourceSystem": "Salesforce", "timestamp": None,
+    "eventId": None, "userId": None, "username": None, "loginType": None,
+    "sourceIp": None, "country": None, "browser": None, "platform": None,
+    "success": None, "sessionId": None, "failureReason": None,
+}
+_SF_API_TMPL = {
+    "eventType": "API_Usage", "sourceSystem": "Salesforce", "timestamp": None,
+    "eventId": None, "userId": None, "apiEndpoint": None, "httpMethod": None,
+    "statusCode": None, "responseTime": None, "recordsProcessed": None,
+    "apiVersion": "v58.0", "clientApplication": None, "sourceIp": None,
+}
+_SF_DATA_TMPL = {
+    "eventType": "Data_Modification", "sourceSystem": "Salesforce",
+    "timestamp": None, "eventId": None, "userId": None, "sobjectType": None,
+    "action": None, "recordId": None, "fieldsModified": None,
+    "oldValues": None, "newValues": None,
+}
+_MS_PERF_TMPL = {
+    "eventType": "MuleSoft_Performance", "sourceSystem": "MuleSoft",
+    "timestamp": None, "eventId": None, "apiName": None, "apiEndpoint": None,
+    "apiVersion": None, "environment": None, "applicationName": None,
+    "responseTime": None, "throughput": None, "memoryUsage": None,
+    "cpuUsage": None, "statusCode": None,
+}
+_MS_ERROR_TMPL = {
+    "eventType": "MuleSoft_Error", "sourceSystem": "MuleSoft",
+    "timestamp": None, "eventId": None, "apiName": None, "apiEndpoint": None,
+    "apiVersion": None, "environment": None, "applicationName": None,
+    "statusCode": None, "errorType": None, "errorMessage": None,
+    "responseTime": None, "retryAttempts": None, "sourceIp": None,
+}
+_MS_UPTIME_TMPL = {
+    "eventType": "MuleSoft_Uptime", "sourceSystem": "MuleSoft",
+    "timestamp": None, "eventId": None, "apiName": None, "apiEndpoint": None,
+    "apiVersion": None, "environment": None, "applicationName": None,
+    "availability": None, "uptime": None, "totalRequests": None,
+    "successfulRequests": None, "failedRequests": None,
+    "avgResponseTime": None, "monitoringPeriod": "1h",
+}
 
 class MultiAPIEventSimulator:
     def __init__(self, function_base_url: str):
         self.function_base_url = function_base_url.rstrip('/')
         self.session = requests.Session()
 
+        # Reuse one pooled keep-alive connection instead of a fresh
+        # TCP/TLS handshake per event; retry transient throttle errors
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.2,
+                              status_forcelist=[429, 502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Connection": "keep-alive"
+        })
+
         # Salesforce sample data
         self.sf_users = [
             "john.doe@company.com", "jane.smith@company.com", "admin@company.com",
@@ -46,177 +158,289 @@ class MultiAPIEventSimulator:
         self.countries = ["US", "UK", "DE", "FR", "CA", "AU", "JP"]
         self.browsers = ["Chrome", "Firefox", "Safari", "Edge"]
 
+        # Pre-drawn value pools (SoA): one batched draw per field replaces
+        # hundreds of per-event random.* calls inside the generators
+        self._rng = np.random.default_rng() if np is not None else None
+        self._sf_status_pool = []
+        self._ms_status_pool = []
+        self._latency_pool = []      # 50-2000 ms Salesforce response times
+        self._ms_latency_prod_pool = []   # base 50-200 ms + 0-100 ms PROD jitter
+        self._ms_latency_other_pool = []  # base 50-200 ms + 0-500 ms non-PROD jitter
+        self._uptime_prod_pool = []
+        self._uptime_other_pool = []
+        self._mem_pool = []
+        self._cpu_pool = []
+        self._ip_pool = []
+        self._uuid_pool = []
+        self._session_pool = []  # 8-hex-char session IDs
+        self._record_pool = []   # 15-hex-char Salesforce record IDs
+
+        # Categorical fields: refilled 256 draws at a time via
+        # random.choices(k=...), whose draw loop runs in C
+        self._choice_pools = {}
+
+        # Integer ranges, keyed by (lo, hi): bulk PCG64 draws when numpy
+        # is present, a single comprehension batch otherwise
+        self._int_pools = {}
+
+    # ===== VALUE POOLS =====
+
+    def _prefill(self, n: int):
+        """Refill every value pool with one batched draw per field."""
+        self._uuid_pool.extend(_uuid_batch(n))
+        session_hex = os.urandom(4 * n).hex()
+        self._session_pool.extend(
+            session_hex[i:i + 8] for i in range(0, 8 * n, 8))
+        record_hex = os.urandom(8 * n).hex().upper()
+        self._record_pool.extend(
+            record_hex[i:i + 15] for i in range(0, 16 * n, 16))
+
+        if self._rng is not None:
+            rng = self._rng
+            sf_p = np.asarray(_SF_STATUS_WEIGHTS, dtype=float)
+            ms_p = np.asarray(_MS_STATUS_WEIGHTS, dtype=float)
+            self._sf_status_pool.extend(
+                rng.choice(_SF_STATUS_CODES, p=sf_p / sf_p.sum(), size=n).tolist())
+            self._ms_status_pool.extend(
+                rng.choice(_MS_STATUS_CODES, p=ms_p / ms_p.sum(), size=n).tolist())
+            self._latency_pool.extend(rng.integers(50, 2001, size=n).tolist())
+            # Per-environment latency = base + jitter, computed as whole-array
+            # arithmetic instead of two randint calls per event
+            base = rng.integers(50, 201, size=n)
+            self._ms_latency_prod_pool.extend(
+                (base + rng.integers(0, 101, size=n)).tolist())
+            self._ms_latency_other_pool.extend(
+                (base + rng.integers(0, 501, size=n)).tolist())
+            self._uptime_prod_pool.extend(
+                np.round(rng.uniform(99.0, 99.99, size=n), 3).tolist())
+            self._uptime_other_pool.extend(
+                np.round(rng.uniform(95.0, 99.5, size=n), 3).tolist())
+            self._mem_pool.extend(np.round(rng.uniform(40.0, 85.0, size=n), 2).tolist())
+            self._cpu_pool.extend(np.round(rng.uniform(15.0, 75.0, size=n), 2).tolist())
+            # Format all n IP strings in vectorized np.char joins rather
+            # than n f-strings with four int->str conversions each
+            parts = rng.integers(1, 256, size=(n, 4)).astype('U3')
+            dotted = parts[:, 0]
+            for col in (1, 2, 3):
+                dotted = np.char.add(np.char.add(dotted, '.'), parts[:, col])
+            self._ip_pool.extend(dotted.tolist())
+        else:
+            self._sf_status_pool.extend(
+                random.choices(_SF_STATUS_CODES, weights=_SF_STATUS_WEIGHTS, k=n))
+            self._ms_status_pool.extend(
+                random.choices(_MS_STATUS_CODES, weights=_MS_STATUS_WEIGHTS, k=n))
+            self._latency_pool.extend(random.randint(50, 2000) for _ in range(n))
+            self._ms_latency_prod_pool.extend(
+                random.randint(50, 200) + random.randint(0, 100) for _ in range(n))
+            self._ms_latency_other_pool.extend(
+                random.randint(50, 200) + random.randint(0, 500) for _ in range(n))
+            self._uptime_prod_pool.extend(
+                round(random.uniform(99.0, 99.99), 3) for _ in range(n))
+            self._uptime_other_pool.extend(
+                round(random.uniform(95.0, 99.5), 3) for _ in range(n))
+            self._mem_pool.extend(round(random.uniform(40.0, 85.0), 2) for _ in range(n))
+            self._cpu_pool.extend(round(random.uniform(15.0, 75.0), 2) for _ in range(n))
+            self._ip_pool.extend(
+                f"{random.randint(1,255)}.{random.randint(1,255)}."
+                f"{random.randint(1,255)}.{random.randint(1,255)}" for _ in range(n))
+
+    def _draw(self, pool: list):
+        """Pop the next pre-drawn value, refilling all pools when one runs dry."""
+        if not pool:
+            self._prefill(_POOL_SIZE)
+        return pool.pop()
+
+    def _choice(self, name: str, population):
+        """Pop the next pre-drawn categorical value for the named field."""
+        pool = self._choice_pools.get(name)
+        if not pool:
+            pool = self._choice_pools[name] = random.choices(population, k=_POOL_SIZE)
+        return pool.pop()
+
+    def _randint(self, lo: int, hi: int) -> int:
+        """Pop the next pre-drawn integer in [lo, hi], batching refills."""
+        pool = self._int_pools.get((lo, hi))
+        if not pool:
+            if self._rng is not None:
+                pool = self._rng.integers(lo, hi + 1, size=_POOL_SIZE).tolist()
+            else:
+                pool = [random.randint(lo, hi) for _ in range(_POOL_SIZE)]
+            self._int_pools[(lo, hi)] = pool
+        return pool.pop()
+
     # ===== SALESFORCE EVENT GENERATORS =====
 
     def generate_sf_login_event(self) -> Dict:
         """Generate a mock Salesforce login event"""
-        user = random.choice(self.sf_users)
-        success = random.choice([True, True, True, False])  # 75% success rate
-
-        event = {
-            "eventType": "Login",
-            "sourceSystem": "Salesforce",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "eventId": str(uuid.uuid4()),
-            "userId": user,
-            "username": user,
-            "loginType": random.choice(["Application", "SAML SSO", "OAuth"]),
-            "sourceIp": f"{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}",
-            "country": random.choice(self.countries),
-            "browser": random.choice(self.browsers),
-            "platform": random.choice(["Windows", "Mac", "Linux", "Mobile"]),
-            "success": success,
-            "sessionId": str(uuid.uuid4())[:8] if success else None,
-            "failureReason": None if success else random.choice([
+        user = self._choice("sf_users", self.sf_users)
+        success = self._choice("login_success", (True, True, True, False))  # 75% success rate
+
+        event = _SF_LOGIN_TMPL.copy()
+        event["timestamp"] = _utcnow_iso()
+        event["eventId"] = self._draw(self._uuid_pool)
+        event["userId"] = user
+        event["username"] = user
+        event["loginType"] = self._choice("login_types", ("Application", "SAML SSO", "OAuth"))
+        event["sourceIp"] = self._draw(self._ip_pool)
+        event["country"] = self._choice("countries", self.countries)
+        event["browser"] = self._choice("browsers", self.browsers)
+        event["platform"] = self._choice("platforms", ("Windows", "Mac", "Linux", "Mobile"))
+        event["success"] = success
+        if success:
+            event["sessionId"] = self._draw(self._session_pool)
+        else:
+            event["failureReason"] = self._choice("failure_reasons", (
                 "Invalid password", "Account locked", "MFA required", "IP restriction"
-            ])
-        }
+            ))
         return event
 
     def generate_sf_api_event(self) -> Dict:
         """Generate a mock Salesforce API usage event"""
-        user = random.choice(self.sf_users)
-        endpoint = random.choice(self.sf_api_endpoints)
-        method = random.choice(["GET", "POST", "PUT", "DELETE", "PATCH"])
-        status_code = random.choices([200, 201, 400, 401, 403, 404, 500],
-                                   weights=[60, 15, 10, 5, 3, 4, 3])[0]
-
-        event = {
-            "eventType": "API_Usage",
-            "sourceSystem": "Salesforce",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "eventId": str(uuid.uuid4()),
-            "userId": user,
-            "apiEndpoint": endpoint,
-            "httpMethod": method,
-            "statusCode": status_code,
-            "responseTime": random.randint(50, 2000),  # milliseconds
-            "recordsProcessed": random.randint(1, 1000) if method == "GET" else random.randint(1, 100),
-            "apiVersion": "v58.0",
-            "clientApplication": random.choice(["Salesforce Mobile", "Data Loader", "Custom App", "Integration"]),
-            "sourceIp": f"{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}"
-        }
+        user = self._choice("sf_users", self.sf_users)
+        endpoint = self._choice("sf_api_endpoints", self.sf_api_endpoints)
+        method = self._choice("http_methods", ("GET", "POST", "PUT", "DELETE", "PATCH"))
+        status_code = self._draw(self._sf_status_pool)
+
+        event = _SF_API_TMPL.copy()
+        event["timestamp"] = _utcnow_iso()
+        event["eventId"] = self._draw(self._uuid_pool)
+        event["userId"] = user
+        event["apiEndpoint"] = endpoint
+        event["httpMethod"] = method
+        event["statusCode"] = status_code
+        event["responseTime"] = self._draw(self._latency_pool)  # milliseconds
+        event["recordsProcessed"] = self._randint(1, 1000) if method == "GET" else self._randint(1, 100)
+        event["clientApplication"] = self._choice("client_apps", ("Salesforce Mobile", "Data Loader", "Custom App", "Integration"))
+        event["sourceIp"] = self._draw(self._ip_pool)
         return event
 
     def generate_sf_data_event(self) -> Dict:
         """Generate a mock Salesforce data modification event"""
-        user = random.choice(self.sf_users)
+        user = self._choice("sf_users", self.sf_users)
         objects = ["Account", "Contact", "Opportunity", "Lead", "Case"]
         actions = ["Create", "Update", "Delete", "View"]
 
-        event = {
-            "eventType": "Data_Modification",
-            "sourceSystem": "Salesforce",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "eventId": str(uuid.uuid4()),
-            "userId": user,
-            "sobjectType": random.choice(objects),
-            "action": random.choice(actions),
-            "recordId": f"{''.join(random.choices('0123456789ABCDEF', k=15))}",
-            "fieldsModified": random.randint(1, 10),
-            "oldValues": {"Status": "New", "Amount": 1000} if random.choice([True, False]) else {},
-            "newValues": {"Status": "Qualified", "Amount": 1500} if random.choice([True, False]) else {}
-        }
+        event = _SF_DATA_TMPL.copy()
+        event["timestamp"] = _utcnow_iso()
+        event["eventId"] = self._draw(self._uuid_pool)
+        event["userId"] = user
+        event["sobjectType"] = self._choice("sf_objects", objects)
+        event["action"] = self._choice("sf_actions", actions)
+        event["recordId"] = self._draw(self._record_pool)
+        event["fieldsModified"] = self._randint(1, 10)
+        event["oldValues"] = {"Status": "New", "Amount": 1000} if self._choice("coin", (True, False)) else {}
+        event["newValues"] = {"Status": "Qualified", "Amount": 1500} if self._choice("coin", (True, False)) else {}
         return event
 
     # ===== MULESOFT EVENT GENERATORS =====
 
     def generate_mulesoft_performance_event(self) -> Dict:
         """Generate MuleSoft API performance/latency event"""
-        api = random.choice(self.mulesoft_apis)
-        env = random.choice(self.mulesoft_environments)
-        app = random.choice(self.mulesoft_apps)
+        api = self._choice("mulesoft_apis", self.mulesoft_apis)
+        env = self._choice("mulesoft_envs", self.mulesoft_environments)
+        app = self._choice("mulesoft_apps", self.mulesoft_apps)
 
-        # Simulate realistic latency patterns
-        base_latency = random.randint(50, 200)
+        # Simulate realistic latency patterns (pre-drawn base + env jitter)
         if env == "PROD":
-            latency = base_latency + random.randint(0, 100)
+            latency = self._draw(self._ms_latency_prod_pool)
         else:
-            latency = base_latency + random.randint(0, 500)
-
-        event = {
-            "eventType": "MuleSoft_Performance",
-            "sourceSystem": "MuleSoft",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "eventId": str(uuid.uuid4()),
-            "apiName": api["name"],
-            "apiEndpoint": api["endpoint"],
-            "apiVersion": api["version"],
-            "environment": env,
-            "applicationName": app,
-            "responseTime": latency,
-            "throughput": random.randint(10, 500),  # requests per minute
-            "memoryUsage": round(random.uniform(40.0, 85.0), 2),  # percentage
-            "cpuUsage": round(random.uniform(15.0, 75.0), 2),  # percentage
-            "statusCode": random.choices([200, 201, 202], weights=[80, 15, 5])[0]
-        }
+            latency = self._draw(self._ms_latency_other_pool)
+
+        event = _MS_PERF_TMPL.copy()
+        event["timestamp"] = _utcnow_iso()
+        event["eventId"] = self._draw(self._uuid_pool)
+        event["apiName"] = api["name"]
+        event["apiEndpoint"] = api["endpoint"]
+        event["apiVersion"] = api["version"]
+        event["environment"] = env
+        event["applicationName"] = app
+        event["responseTime"] = latency
+        event["throughput"] = self._randint(10, 500)  # requests per minute
+        event["memoryUsage"] = self._draw(self._mem_pool)  # percentage
+        event["cpuUsage"] = self._draw(self._cpu_pool)  # percentage
+        event["statusCode"] = self._draw(self._ms_status_pool)
         return event
 
     def generate_mulesoft_error_event(self) -> Dict:
         """Generate MuleSoft API error event"""
-        api = random.choice(self.mulesoft_apis)
-        env = random.choice(self.mulesoft_environments)
-        app = random.choice(self.mulesoft_apps)
+        api = self._choice("mulesoft_apis", self.mulesoft_apis)
+        env = self._choice("mulesoft_envs", self.mulesoft_environments)
+        app = self._choice("mulesoft_apps", self.mulesoft_apps)
 
-        error_codes = [400, 401, 403, 404, 429, 500, 502, 503, 504]
-        error_types = [
+        error_codes = (400, 401, 403, 404, 429, 500, 502, 503, 504)
+        error_types = (
             "CONNECTIVITY", "TIMEOUT", "SECURITY", "ROUTING",
             "TRANSFORMATION", "POLICY_VIOLATION", "RATE_LIMIT_EXCEEDED"
-        ]
-
-        status_code = random.choice(error_codes)
-
-        event = {
-            "eventType": "MuleSoft_Error",
-            "sourceSystem": "MuleSoft",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "eventId": str(uuid.uuid4()),
-            "apiName": api["name"],
-            "apiEndpoint": api["endpoint"],
-            "apiVersion": api["version"],
-            "environment": env,
-            "applicationName": app,
-            "statusCode": status_code,
-            "errorType": random.choice(error_types),
-            "errorMessage": f"API error occurred: {status_code}",
-            "responseTime": random.randint(1000, 10000),  # slower for errors
-            "retryAttempts": random.randint(0, 3),
-            "sourceIp": f"{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}"
-        }
+        )
+
+        status_code = self._choice("ms_error_codes", error_codes)
+
+        event = _MS_ERROR_TMPL.copy()
+        event["timestamp"] = _utcnow_iso()
+        event["eventId"] = self._draw(self._uuid_pool)
+        event["apiName"] = api["name"]
+        event["apiEndpoint"] = api["endpoint"]
+        event["apiVersion"] = api["version"]
+        event["environment"] = env
+        event["applicationName"] = app
+        event["statusCode"] = status_code
+        event["errorType"] = self._choice("ms_error_types", error_types)
+        event["errorMessage"] = f"API error occurred: {status_code}"
+        event["responseTime"] = self._randint(1000, 10000)  # slower for errors
+        event["retryAttempts"] = self._randint(0, 3)
+        event["sourceIp"] = self._draw(self._ip_pool)
         return event
 
     def generate_mulesoft_uptime_event(self) -> Dict:
         """Generate MuleSoft uptime/availability event"""
-        api = random.choice(self.mulesoft_apis)
-        env = random.choice(self.mulesoft_environments)
-        app = random.choice(self.mulesoft_apps)
+        api = self._choice("mulesoft_apis", self.mulesoft_apis)
+        env = self._choice("mulesoft_envs", self.mulesoft_environments)
+        app = self._choice("mulesoft_apps", self.mulesoft_apps)
 
         # Simulate uptime percentage (higher for PROD)
         if env == "PROD":
-            uptime = round(random.uniform(99.0, 99.99), 3)
+            uptime = self._draw(self._uptime_prod_pool)
         else:
-            uptime = round(random.uniform(95.0, 99.5), 3)
-
-        event = {
-            "eventType": "MuleSoft_Uptime",
-            "sourceSystem": "MuleSoft",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "eventId": str(uuid.uuid4()),
-            "apiName": api["name"],
-            "apiEndpoint": api["endpoint"],
-            "apiVersion": api["version"],
-            "environment": env,
-            "applicationName": app,
-            "availability": uptime,
-            "uptime": uptime,
-            "totalRequests": random.randint(1000, 50000),
-            "successfulRequests": random.randint(950, 49500),
-            "failedRequests": random.randint(0, 500),
-            "avgResponseTime": random.randint(80, 300),
-            "monitoringPeriod": "1h"  # 1 hour monitoring window
-        }
+            uptime = self._draw(self._uptime_other_pool)
+
+        event = _MS_UPTIME_TMPL.copy()
+        event["timestamp"] = _utcnow_iso()
+        event["eventId"] = self._draw(self._uuid_pool)
+        event["apiName"] = api["name"]
+        event["apiEndpoint"] = api["endpoint"]
+        event["apiVersion"] = api["version"]
+        event["environment"] = env
+        event["applicationName"] = app
+        event["availability"] = uptime
+        event["uptime"] = uptime
+        event["totalRequests"] = self._randint(1000, 50000)
+        event["successfulRequests"] = self._randint(950, 49500)
+        event["failedRequests"] = self._randint(0, 500)
+        event["avgResponseTime"] = self._randint(80, 300)
         return event
 
+    # ===== BATCH FACTORIES =====
+
+    def generate_sf_api_events(self, n: int) -> List[Dict]:
+        """Generate n API usage events off a single batched pool refill."""
+        self._prefill(n)
+        return [self.generate_sf_api_event() for _ in range(n)]
+
+    def generate_mulesoft_performance_events(self, n: int) -> List[Dict]:
+        """Generate n performance events off a single batched pool refill."""
+        self._prefill(n)
+        return [self.generate_mulesoft_performance_event() for _ in range(n)]
+
+    def generate_mulesoft_error_events(self, n: int) -> List[Dict]:
+        """Generate n error events off a single batched pool refill."""
+        self._prefill(n)
+        return [self.generate_mulesoft_error_event() for _ in range(n)]
+
+    def generate_mulesoft_uptime_events(self, n: int) -> List[Dict]:
+        """Generate n uptime events off a single batched pool refill."""
+        self._prefill(n)
+        return [self.generate_mulesoft_uptime_event() for _ in range(n)]
+
     # ===== SENDING LOGIC =====
 
     def send_event(self, event: Dict, endpoint: str = "universalLogHandler") -> bool:
@@ -226,14 +450,9 @@ class MultiAPIEventSimulator:
             endpoint_lower = endpoint.lower()
             url = f"{self.function_base_url}/api/{endpoint_lower}"
 
-            response = requests.post(
-                url,
-                json=event,
-                timeout=10,
-                headers={"Content-Type": "application/json"}
-            )
+            response = self.session.post(url, json=event, timeout=10)
 
-            if response.status_code == 200:
+            if response.status_code in (200, 202):
                 print(f"✅ Successfully sent {event['eventType']} event to {endpoint}")
                 return True
             else:
@@ -244,6 +463,105 @@ class MultiAPIEventSimulator:
             print(f"❌ Error sending event: {str(e)}")
             return False
 
+    def _pick_generator(self):
+        """Pick a random event generator (40% Salesforce, 60% MuleSoft)"""
+        if random.random() < 0.4:  # Salesforce event
+            event_generators = [
+                self.generate_sf_login_event,
+                self.generate_sf_api_event,
+                self.generate_sf_data_event
+            ]
+            generator = random.choices(event_generators, weights=[20, 60, 20])[0]
+            return generator, "salesforceloghandler", "Salesforce"
+        else:  # MuleSoft event
+            event_generators = [
+                self.generate_mulesoft_performance_event,
+                self.generate_mulesoft_error_event,
+                self.generate_mulesoft_uptime_event
+            ]
+            generator = random.choices(event_generators, weights=[60, 25, 15])[0]
+            return generator, "mulesoftloghandler", "MuleSoft"
+
+    def _run_simulation_threaded(self, duration_minutes: int, events_per_minute: int):
+        """Thread-pool fallback transport used when aiohttp is unavailable"""
+        end_time = datetime.now() + timedelta(minutes=duration_minutes)
+        event_count = 0
+        success_count = 0
+        event_types = {'Salesforce': 0, 'MuleSoft': 0}
+        futures = []
+        interval = 60 / events_per_minute
+
+        # Sends are I/O-bound HTTPS round-trips, so dispatch them through a
+        # thread pool and pace submissions against a monotonic deadline
+        # instead of sleeping a fixed interval after each blocking send
+        with ThreadPoolExecutor(max_workers=min(32, events_per_minute)) as executor:
+            next_send = time.monotonic()
+
+            while datetime.now() < end_time:
+                generator, endpoint, source = self._pick_generator()
+                event_types[source] += 1
+                futures.append(executor.submit(self.send_event, generator(), endpoint))
+                event_count += 1
+
+                # Wait until the next submission deadline
+                next_send += interval
+                time.sleep(max(0, next_send - time.monotonic()))
+
+            for future in as_completed(futures):
+                if future.result():
+                    success_count += 1
+
+        return event_count, success_count, event_types
+
+    async def send_event_async(self, session, event: Dict, endpoint: str = "universalLogHandler") -> bool:
+        """Send event to Azure Function over the shared aiohttp session"""
+        try:
+            url = f"{self.function_base_url}/api/{endpoint.lower()}"
+            async with session.post(url, json=event,
+                                    timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status in (200, 202):
+                    print(f"✅ Successfully sent {event['eventType']} event to {endpoint}")
+                    return True
+                text = await response.text()
+                print(f"❌ Failed to send event: {response.status} - {text}")
+                return False
+        except Exception as e:
+            print(f"❌ Error sending event: {str(e)}")
+            return False
+
+    async def run_simulation_async(self, duration_minutes: int = 5, events_per_minute: int = 6):
+        """Run the simulation on a single event loop with concurrent in-flight sends"""
+        end_time = time.monotonic() + duration_minutes * 60
+        interval = 60 / events_per_minute
+        event_count = 0
+        event_types = {'Salesforce': 0, 'MuleSoft': 0}
+        tasks = []
+
+        # Cap in-flight sends so a slow endpoint applies backpressure
+        semaphore = asyncio.Semaphore(max(1, events_per_minute))
+
+        async def throttled_send(session, event, endpoint):
+            async with semaphore:
+                return await self.send_event_async(session, event, endpoint)
+
+        connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            next_send = time.monotonic()
+
+            while time.monotonic() < end_time:
+                generator, endpoint, source = self._pick_generator()
+                event_types[source] += 1
+                tasks.append(asyncio.create_task(
+                    throttled_send(session, generator(), endpoint)))
+                event_count += 1
+
+                next_send += interval
+                await asyncio.sleep(max(0, next_send - time.monotonic()))
+
+            results = await asyncio.gather(*tasks)
+
+        return event_count, sum(1 for ok in results if ok), event_types
+
     def run_simulation(self, duration_minutes: int = 5, events_per_minute: int = 6):
         """Run the simulation for specified duration with mixed event types"""
         print(f"🚀 Starting Multi-API Event Simulation")
@@ -253,51 +571,86 @@ class MultiAPIEventSimulator:
         print("   Event Types: Salesforce + MuleSoft")
         print("-" * 60)
 
-        end_time = datetime.now() + timedelta(minutes=duration_minutes)
+        if aiohttp is not None:
+            # One event loop multiplexes every in-flight POST on a single
+            # thread, so per-request overhead is just a coroutine frame
+            event_count, success_count, event_types = asyncio.run(
+                self.run_simulation_async(duration_minutes, events_per_minute))
+        else:
+            event_count, success_count, event_types = self._run_simulation_threaded(
+                duration_minutes, events_per_minute)
+
+        print("-" * 60)
+        print(f"🏁 Simulation Complete!")
+        print(f"   Total Events: {event_count}")
+        print(f"   Successful: {success_count}")
+        print(f"   Failed: {event_count - success_count}")
+        print(f"   Success Rate: {(success_count/event_count*100):.1f}%")
+        print(f"   Salesforce Events: {event_types['Salesforce']}")
+        print(f"   MuleSoft Events: {event_types['MuleSoft']}")
+
+    def run_simulation_multiprocess(self, duration_minutes: int = 5,
+                                    events_per_minute: int = 6, workers: int = None):
+        """Fan the requested rate out across worker processes.
+
+        Useful once event assembly itself (RNG + JSON) saturates one
+        core; each worker builds its own simulator so no Session socket
+        is shared across the fork boundary.
+        """
+        cpu_count = os.cpu_count() or 1
+        workers = min(cpu_count, workers or cpu_count)
+        sub_rate = max(1, events_per_minute // workers)
+
+        print(f"🚀 Starting Multi-API Event Simulation ({workers} processes)")
+        print(f"   Duration: {duration_minutes} minutes")
+        print(f"   Rate: {events_per_minute} events/minute ({sub_rate}/worker)")
+        print(f"   Target: {self.function_base_url}")
+        print("-" * 60)
+
+        mp_context = multiprocessing.get_context(
+            "fork" if hasattr(os, "fork") else "spawn")
         event_count = 0
         success_count = 0
         event_types = {'Salesforce': 0, 'MuleSoft': 0}
 
-        while datetime.now() < end_time:
-            # Generate random event type (40% Salesforce, 60% MuleSoft)
-            if random.random() < 0.4:  # Salesforce event
-                event_generators = [
-                    self.generate_sf_login_event,
-                    self.generate_sf_api_event,
-                    self.generate_sf_data_event
-                ]
-                generator = random.choices(event_generators, weights=[20, 60, 20])[0]
-                endpoint = "salesforceloghandler"
-                event_types['Salesforce'] += 1
-            else:  # MuleSoft event
-                event_generators = [
-                    self.generate_mulesoft_performance_event,
-                    self.generate_mulesoft_error_event,
-                    self.generate_mulesoft_uptime_event
-                ]
-                generator = random.choices(event_generators, weights=[60, 25, 15])[0]
-                endpoint = "mulesoftloghandler"
-                event_types['MuleSoft'] += 1
-
-            event = generator()
-
-            if self.send_event(event, endpoint):
-                success_count += 1
-
-            event_count += 1
-
-            # Wait before next event
-            time.sleep(60 / events_per_minute)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            futures = [
+                executor.submit(_run_simulation_worker, self.function_base_url,
+                                duration_minutes, sub_rate)
+                for _ in range(workers)
+            ]
+            for future in as_completed(futures):
+                count, successes, types = future.result()
+                event_count += count
+                success_count += successes
+                for source, n in types.items():
+                    event_types[source] += n
 
         print("-" * 60)
         print(f"🏁 Simulation Complete!")
         print(f"   Total Events: {event_count}")
         print(f"   Successful: {success_count}")
         print(f"   Failed: {event_count - success_count}")
-        print(f"   Success Rate: {(success_count/event_count*100):.1f}%")
+        if event_count:
+            print(f"   Success Rate: {(success_count/event_count*100):.1f}%")
         print(f"   Salesforce Events: {event_types['Salesforce']}")
         print(f"   MuleSoft Events: {event_types['MuleSoft']}")
 
+        return event_count, success_count, event_types
+
+def _run_simulation_worker(function_base_url: str, duration_minutes: int,
+                           events_per_minute: int):
+    """Run one worker's share of a multiprocess simulation.
+
+    Builds a fresh simulator (and therefore a fresh Session) in the
+    child: pooled sockets must not be reused across a fork.
+    """
+    simulator = MultiAPIEventSimulator(function_base_url)
+    if aiohttp is not None:
+        return asyncio.run(
+            simulator.run_simulation_async(duration_minutes, events_per_minute))
+    return simulator._run_simulation_threaded(duration_minutes, events_per_minute)
+
 def main():
     """Main function to run the simulator"""
 
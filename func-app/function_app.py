@@ -1,73 +1,189 @@
 import os
-import json
 import datetime
+import time
 import hashlib
-import hmac
 import base64
 import logging
+import threading
+from collections import defaultdict, deque
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import azure.functions as func
 
 # Pull from your Function App's app_settings (wired in Terraform)
 WS_ID  = os.environ.get("LOG_ANALYTICS_WORKSPACE_ID")
 WS_KEY = os.environ.get("LOG_ANALYTICS_PRIMARY_KEY")
 
-def post_to_law(body: dict, log_type: str):
-    """Send a single JSON object into the LA workspace as <log_type>_CL."""
+# Invariants for post_to_law, computed once at import instead of per call
+_DECODED_KEY = base64.b64decode(WS_KEY) if WS_KEY else None
+_LAW_URL = f"https://{WS_ID}.ods.opinsights.azure.com/api/logs?api-version=2016-04-01"
+_STATIC_HEADER_TMPL = {"Content-Type": "application/json"}
+
+# Fixed fragments of the string-to-sign, kept as bytes so the signature
+# input is assembled with one join and no intermediate str
+_SIG_METHOD = b"POST"
+_SIG_CTYPE = b"application/json"
+_SIG_DATE_PREFIX = b"x-ms-date:"
+_SIG_RESOURCE = b"/api/logs"
+
+# HMAC-SHA256 inner/outer key pads, derived once: hmac.new() would
+# re-run the key schedule on every signature for a key that never changes
+if _DECODED_KEY is not None:
+    _hmac_key = (hashlib.sha256(_DECODED_KEY).digest()
+                 if len(_DECODED_KEY) > 64 else _DECODED_KEY).ljust(64, b"\x00")
+    _IPAD = bytes(b ^ 0x36 for b in _hmac_key)
+    _OPAD = bytes(b ^ 0x5C for b in _hmac_key)
+else:
+    _IPAD = _OPAD = None
+
+# One pooled session per worker: the TLS connection to the ingestion
+# endpoint survives across warm invocations instead of being rebuilt
+_LAW_SESSION = requests.Session()
+_LAW_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.1,
+                      status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Millisecond-resolution timestamp cache: requests landing in the same
+# millisecond share one formatted string instead of a fresh datetime
+_TS_CACHE = [0, ""]
+
+def _utcnow_iso() -> str:
+    """Current UTC time as an ISO-8601 string, cached per millisecond."""
+    ms = int(time.time() * 1000)
+    if ms != _TS_CACHE[0]:
+        _TS_CACHE[0] = ms
+        _TS_CACHE[1] = datetime.datetime.utcfromtimestamp(ms / 1000).isoformat(
+            timespec='milliseconds') + 'Z'
+    return _TS_CACHE[1]
+
+# Batching: events are buffered per log type and flushed as one JSON
+# array, so N events share a single HTTPS round-trip and HMAC signature
+FLUSH_SEC = float(os.environ.get("LAW_FLUSH_SEC", "2"))
+MAX_BATCH = int(os.environ.get("LAW_MAX_BATCH", "100"))
+
+_BUFFERS = defaultdict(deque)
+_BUFFER_LOCK = threading.Lock()
+_FLUSH_TIMER = None
+
+def _flush_buffers():
+    """Drain every buffered log type and post each as a single batch."""
+    global _FLUSH_TIMER
+    with _BUFFER_LOCK:
+        _FLUSH_TIMER = None
+        pending = []
+        for log_type, buf in _BUFFERS.items():
+            if buf:
+                pending.append((log_type, list(buf)))
+                buf.clear()
+
+    for log_type, encoded in pending:
+        post_to_law(b"[" + b",".join(encoded) + b"]", log_type)
+
+def enqueue_for_law(encoded: bytes, log_type: str):
+    """Buffer an encoded event; flush immediately at MAX_BATCH, else on the timer.
+
+    Events are buffered as their JSON bytes so a flush is a join, not a
+    re-serialization of every buffered dict.
+    """
+    global _FLUSH_TIMER
+    flush_now = None
+    with _BUFFER_LOCK:
+        buf = _BUFFERS[log_type]
+        buf.append(encoded)
+        if len(buf) >= MAX_BATCH:
+            flush_now = list(buf)
+            buf.clear()
+        elif _FLUSH_TIMER is None:
+            _FLUSH_TIMER = threading.Timer(FLUSH_SEC, _flush_buffers)
+            _FLUSH_TIMER.daemon = True
+            _FLUSH_TIMER.start()
+
+    if flush_now:
+        post_to_law(b"[" + b",".join(flush_now) + b"]", log_type)
+
+def post_to_law(body, log_type: str):
+    """Send a JSON object (or list of objects) into the LA workspace as <log_type>_CL.
+
+    Accepts pre-encoded JSON bytes as-is, so callers holding the raw
+    request body never pay a decode/re-encode round trip.
+    """
     if not WS_ID or not WS_KEY:
         logging.error("Missing LOG_ANALYTICS_WORKSPACE_ID or LOG_ANALYTICS_PRIMARY_KEY")
         return 500, "Missing workspace configuration"
 
-    body_json = json.dumps(body)
+    if isinstance(body, (bytes, bytearray)):
+        body_json = body
+    else:
+        body_json = orjson.dumps(body)  # bytes; exactly what requests wants for data=
     ts = datetime.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")
 
-    string_to_hash = (
-        f"POST\n"
-        f"{len(body_json)}\n"
-        f"application/json\n"
-        f"x-ms-date:{ts}\n"
-        f"/api/logs"
-    )
-    decoded_key = base64.b64decode(WS_KEY)
-    signature   = base64.b64encode(
-        hmac.new(decoded_key, string_to_hash.encode("utf-8"), hashlib.sha256).digest()
-    ).decode()
+    sig_buf = b"\n".join((
+        _SIG_METHOD,
+        b"%d" % len(body_json),
+        _SIG_CTYPE,
+        _SIG_DATE_PREFIX + ts.encode("ascii"),
+        _SIG_RESOURCE,
+    ))
+    inner = hashlib.sha256(_IPAD)
+    inner.update(sig_buf)
+    outer = hashlib.sha256(_OPAD)
+    outer.update(inner.digest())
+    signature = base64.b64encode(outer.digest()).decode()
 
     headers = {
-        "Content-Type":  "application/json",
+        **_STATIC_HEADER_TMPL,
         "Authorization": f"SharedKey {WS_ID}:{signature}",
         "Log-Type":      log_type,
         "x-ms-date":     ts
     }
-    url = f"https://{WS_ID}.ods.opinsights.azure.com/api/logs?api-version=2016-04-01"
 
     try:
-        resp = requests.post(url, data=body_json, headers=headers, timeout=10)
-        logging.info(f"Log Analytics response: {resp.status_code} for {log_type}")
+        resp = _LAW_SESSION.post(_LAW_URL, data=body_json, headers=headers, timeout=10)
+        logging.info("Log Analytics response: %s for %s", resp.status_code, log_type)
         return resp.status_code, resp.text
     except requests.exceptions.RequestException as e:
         logging.error(f"Error posting to Log Analytics: {str(e)}")
         return 500, f"Error posting to Log Analytics: {str(e)}"
 
+# Exact eventType values the simulators emit, resolved in one dict hit
+_MULE_FASTPATH = {
+    'MuleSoft_Performance': 'MuleSoftPerformance',
+    'MuleSoft_Error':       'MuleSoftError',
+    'MuleSoft_Uptime':      'MuleSoftUptime',
+}
+
 def determine_log_type(event_data: dict) -> str:
     """Determine the appropriate log type based on event content."""
     event_type = event_data.get('eventType', '')
+
+    # Fast path: known eventType needs no string scanning at all
+    log_type = _MULE_FASTPATH.get(event_type)
+    if log_type is not None:
+        return log_type
+
     source_system = event_data.get('sourceSystem', '').lower()
 
     # MuleSoft events
     if source_system == 'mulesoft' or event_type.startswith('MuleSoft'):
         if 'latency' in event_data or 'responseTime' in event_data:
             return 'MuleSoftPerformance'
-        elif 'error' in event_data or event_data.get('statusCode', 0) >= 400:
-            return 'MuleSoftError'
-        elif 'uptime' in event_data or 'availability' in event_data:
+        try:
+            if 'error' in event_data or event_data['statusCode'] >= 400:
+                return 'MuleSoftError'
+        except KeyError:
+            pass
+        if 'uptime' in event_data or 'availability' in event_data:
             return 'MuleSoftUptime'
-        else:
-            return 'MuleSoftGeneral'
+        return 'MuleSoftGeneral'
 
     # Salesforce events (existing)
-    elif 'salesforce' in source_system or event_type in ['Login', 'API_Usage', 'Data_Modification']:
+    elif 'salesforce' in source_system or event_type in ('Login', 'API_Usage', 'Data_Modification'):
         return 'SalesforceEvent'
 
     # Default fallback
@@ -76,99 +192,69 @@ def determine_log_type(event_data: dict) -> str:
 
 app = func.FunctionApp()
 
-@app.route(route="salesforceLogHandler", auth_level=func.AuthLevel.ANONYMOUS)
-def salesforceLogHandler(req: func.HttpRequest) -> func.HttpResponse:
-    """Legacy endpoint for Salesforce events - maintains backward compatibility"""
-    logging.info("▶ salesforceLogHandler invoked")
-
+def _handle(req: func.HttpRequest, label: str, default_source: str = None,
+            force_log_type: str = None) -> func.HttpResponse:
+    """Shared parse/stamp/enqueue logic behind the three route handlers."""
+    raw = req.get_body()
     try:
-        payload = req.get_json()
+        payload = orjson.loads(raw) if raw else None
         if not payload:
             return func.HttpResponse("Empty or invalid JSON payload", status_code=400)
 
-        logging.info(f"Received Salesforce payload: {json.dumps(payload)}")
+        # Lazy %-style args: the payload is only stringified if the
+        # record is actually emitted
+        logging.debug("Received %s payload: %s", label, payload)
 
-    except ValueError as e:
+    except (orjson.JSONDecodeError, ValueError) as e:
         logging.error(f"JSON parsing error: {str(e)}")
         return func.HttpResponse("Invalid JSON", status_code=400)
 
-    # Add timestamp and source system if not present
+    # Batched payloads: the simulators may POST a JSON array of events;
+    # stamp and enqueue each element so the whole batch costs one request
+    if isinstance(payload, list):
+        ts = _utcnow_iso()
+        for item in payload:
+            if 'timestamp' not in item:
+                item['timestamp'] = ts
+            if default_source is not None and 'sourceSystem' not in item:
+                item['sourceSystem'] = default_source
+            enqueue_for_law(orjson.dumps(item),
+                            force_log_type or determine_log_type(item))
+        return func.HttpResponse(
+            f"{label} batch of {len(payload)} events accepted for batched delivery",
+            status_code=202)
+
+    # Add timestamp and source system if not present; only a mutated
+    # payload needs re-encoding, otherwise the raw bytes go on the wire
+    mutated = False
     if 'timestamp' not in payload:
-        payload['timestamp'] = datetime.datetime.utcnow().isoformat()
-    if 'sourceSystem' not in payload:
-        payload['sourceSystem'] = 'Salesforce'
+        payload['timestamp'] = _utcnow_iso()
+        mutated = True
+    if default_source is not None and 'sourceSystem' not in payload:
+        payload['sourceSystem'] = default_source
+        mutated = True
 
-    code, text = post_to_law(payload, "SalesforceEvent")
+    log_type = force_log_type or determine_log_type(payload)
 
-    if code == 200:
-        logging.info("Successfully sent Salesforce event to Log Analytics")
-        return func.HttpResponse(f"Salesforce event logged successfully: {text}", status_code=200)
-    else:
-        logging.error(f"Failed to send Salesforce event: {code} - {text}")
-        return func.HttpResponse(f"Failed to log Salesforce event: {text}", status_code=code)
+    enqueue_for_law(orjson.dumps(payload) if mutated else raw, log_type)
+    return func.HttpResponse(f"{label} event accepted for batched delivery to {log_type}",
+                             status_code=202)
+
+@app.route(route="salesforceLogHandler", auth_level=func.AuthLevel.ANONYMOUS)
+def salesforceLogHandler(req: func.HttpRequest) -> func.HttpResponse:
+    """Legacy endpoint for Salesforce events - maintains backward compatibility"""
+    logging.info("▶ salesforceLogHandler invoked")
+    return _handle(req, "Salesforce", default_source="Salesforce",
+                   force_log_type="SalesforceEvent")
 
 @app.route(route="mulesoftLogHandler", auth_level=func.AuthLevel.ANONYMOUS)
 def mulesoftLogHandler(req: func.HttpRequest) -> func.HttpResponse:
     """Dedicated endpoint for MuleSoft events"""
     logging.info("▶ mulesoftLogHandler invoked")
-
-    try:
-        payload = req.get_json()
-        if not payload:
-            return func.HttpResponse("Empty or invalid JSON payload", status_code=400)
-
-        logging.info(f"Received MuleSoft payload: {json.dumps(payload)}")
-
-    except ValueError as e:
-        logging.error(f"JSON parsing error: {str(e)}")
-        return func.HttpResponse("Invalid JSON", status_code=400)
-
-    # Add timestamp and source system if not present
-    if 'timestamp' not in payload:
-        payload['timestamp'] = datetime.datetime.utcnow().isoformat()
-    if 'sourceSystem' not in payload:
-        payload['sourceSystem'] = 'MuleSoft'
-
-    # Determine specific log type for MuleSoft
-    log_type = determine_log_type(payload)
-
-    code, text = post_to_law(payload, log_type)
-
-    if code == 200:
-        logging.info(f"Successfully sent MuleSoft event to Log Analytics ({log_type})")
-        return func.HttpResponse(f"MuleSoft event logged successfully to {log_type}: {text}", status_code=200)
-    else:
-        logging.error(f"Failed to send MuleSoft event: {code} - {text}")
-        return func.HttpResponse(f"Failed to log MuleSoft event: {text}", status_code=code)
+    return _handle(req, "MuleSoft", default_source="MuleSoft")
 
 @app.route(route="universalLogHandler", auth_level=func.AuthLevel.ANONYMOUS)
 def universalLogHandler(req: func.HttpRequest) -> func.HttpResponse:
     """Universal endpoint that can handle any event type and route appropriately"""
     logging.info("▶ universalLogHandler invoked")
-
-    try:
-        payload = req.get_json()
-        if not payload:
-            return func.HttpResponse("Empty or invalid JSON payload", status_code=400)
-
-        logging.info(f"Received universal payload: {json.dumps(payload)}")
-
-    except ValueError as e:
-        logging.error(f"JSON parsing error: {str(e)}")
-        return func.HttpResponse("Invalid JSON", status_code=400)
-
-    # Add timestamp if not present
-    if 'timestamp' not in payload:
-        payload['timestamp'] = datetime.datetime.utcnow().isoformat()
-
-    # Determine the appropriate log type
-    log_type = determine_log_type(payload)
-
-    code, text = post_to_law(payload, log_type)
-
-    if code == 200:
-        logging.info(f"Successfully sent event to Log Analytics ({log_type})")
-        return func.HttpResponse(f"Event logged successfully to {log_type}: {text}", status_code=200)
-    else:
-        logging.error(f"Failed to send event: {code} - {text}")
-        return func.HttpResponse(f"Failed to log event: {text}", status_code=code)
+    return _handle(req, "universal")
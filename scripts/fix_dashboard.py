@@ -8,13 +8,53 @@ import sys
 import os
 import time
 import json
+import hashlib
+import string
 import subprocess
+import tempfile
+import textwrap
 from datetime import datetime, timedelta
+from pathlib import Path
 
-def run_azure_command(command):
-    """Run an Azure CLI command and return the result"""
+try:
+    import orjson
+except ImportError:
+    orjson = None  # falls back to the stdlib json encoder
+
+try:
+    from azure.identity import DefaultAzureCredential
+except ImportError:
+    DefaultAzureCredential = None  # falls back to shelling out to the az CLI
+
+try:
+    from azure.monitor.query import LogsQueryClient
+except ImportError:
+    LogsQueryClient = None  # falls back to the REST endpoint or the az CLI
+
+_LAW_API = "https://api.loganalytics.io"
+
+# Bearer token cached across queries (and across main() runs in a
+# long-lived process): every az CLI invocation otherwise re-walks
+# token discovery before the query even leaves the machine
+_TOKEN_CACHE = [0.0, ""]  # expires_on, token
+
+def _get_law_token():
+    """Access token for the Log Analytics REST API, refreshed near expiry."""
+    if time.time() < _TOKEN_CACHE[0] - 300:
+        return _TOKEN_CACHE[1]
+    token = DefaultAzureCredential().get_token(f"{_LAW_API}/.default")
+    _TOKEN_CACHE[0] = token.expires_on
+    _TOKEN_CACHE[1] = token.token
+    return token.token
+
+def run_azure_command(argv):
+    """Run an Azure CLI command (as an argv list) and return the result.
+
+    Passing argv directly skips the /bin/sh fork and its quote parsing,
+    which also keeps embedded quotes in KQL queries intact.
+    """
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
+        result = subprocess.run(argv, shell=False, capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             return True, result.stdout.strip()
         else:
@@ -24,48 +64,152 @@ def run_azure_command(command):
     except Exception as e:
         return False, str(e)
 
+# Custom tables the pipeline writes; the diagnostic counts each in one scan
+_CL_TABLES = (
+    "SalesforceEvent_CL",
+    "MuleSoftPerformance_CL",
+    "MuleSoftError_CL",
+    "MuleSoftUptime_CL",
+)
+
+# One union covers every table in a single backend scan; isfuzzy keeps
+# the query valid while tables that haven't received data yet are missing
+_DATA_CHECK_KQL = (
+    "union isfuzzy=true " + ", ".join(_CL_TABLES) +
+    " | where TimeGenerated > ago(1h)"
+    " | summarize count() by Type"
+)
+
+# Diagnostic runs minutes apart re-ask Log Analytics the same question;
+# cache the counts on disk for a short TTL, keyed by the query text so
+# editing the KQL invalidates the file
+_CACHE_TTL_SEC = 300
+
+def _cache_path() -> Path:
+    digest = hashlib.sha256(_DATA_CHECK_KQL.encode()).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"fix_dashboard_cache_{digest}.json"
+
 def check_log_analytics_data():
     """Check if data exists in Log Analytics"""
     print("🔍 Checking Log Analytics Data...")
 
     workspace_id = "7208379a-ae11-4c06-bb1c-a8fc4d0c34b4"
 
-    # Check for any data in the last hour
-    queries = [
-        "search * | where TimeGenerated > ago(1h) | limit 5",
-        "SalesforceEvent_CL | limit 5",
-        "MuleSoftPerformance_CL | limit 5",
-        "MuleSoftError_CL | limit 5",
-        "MuleSoftUptime_CL | limit 5"
-    ]
-
-    results = {}
-
-    for query in queries:
-        print(f"   Testing query: {query}")
-        command = f'az monitor log-analytics query --workspace {workspace_id} --analytics-query "{query}" --output json'
-        success, output = run_azure_command(command)
-
-        if success:
-            try:
-                data = json.loads(output)
-                count = len(data.get('tables', [{}])[0].get('rows', []))
-                results[query] = count
-                print(f"   ✅ Found {count} records")
-            except:
-                results[query] = 0
-                print(f"   ⚠️ No data or parsing error")
-        else:
-            results[query] = -1
+    cache_path = _cache_path()
+    try:
+        if time.time() - cache_path.stat().st_mtime < _CACHE_TTL_SEC:
+            results = json.loads(cache_path.read_text())
+            print(f"   ♻️ Using results cached within the last {_CACHE_TTL_SEC // 60} minutes")
+            for table, count in results.items():
+                print(f"   ✅ {table}: {count} records")
+            return results
+    except (OSError, ValueError):
+        pass  # no cache, stale mtime read, or corrupt file: query fresh
+
+    print(f"   Testing query: {_DATA_CHECK_KQL}")
+    results = {table: 0 for table in _CL_TABLES}
+
+    if LogsQueryClient is not None:
+        # Single SDK request: one HTTPS round trip and one credential
+        # lookup instead of an az CLI process per table
+        client = LogsQueryClient(DefaultAzureCredential())
+        try:
+            response = client.query_workspace(workspace_id, _DATA_CHECK_KQL,
+                                              timespan=timedelta(hours=1))
+        except Exception as e:
+            print(f"   ❌ Query failed: {str(e)}")
+            return {table: -1 for table in _CL_TABLES}
+
+        rows = response.tables[0].rows if response.tables else []
+    elif DefaultAzureCredential is not None:
+        # No query SDK, but a credential: hit the REST endpoint directly
+        # with the cached token instead of paying az CLI startup
+        import requests
+
+        try:
+            response = requests.post(
+                f"{_LAW_API}/v1/workspaces/{workspace_id}/query",
+                headers={"Authorization": f"Bearer {_get_law_token()}"},
+                json={"query": _DATA_CHECK_KQL},
+                timeout=30
+            )
+            response.raise_for_status()
+            rows = response.json().get('tables', [{}])[0].get('rows', [])
+        except Exception as e:
+            print(f"   ❌ Query failed: {str(e)}")
+            return {table: -1 for table in _CL_TABLES}
+    else:
+        success, output = run_azure_command([
+            "az", "monitor", "log-analytics", "query",
+            "--workspace", workspace_id,
+            "--analytics-query", _DATA_CHECK_KQL,
+            "--output", "json"
+        ])
+
+        if not success:
             print(f"   ❌ Query failed: {output}")
+            return {table: -1 for table in _CL_TABLES}
+
+        try:
+            # The CLI envelope can run to megabytes; orjson parses it
+            # a few times faster than the stdlib when it's installed
+            data = orjson.loads(output) if orjson is not None else json.loads(output)
+            rows = data.get('tables', [{}])[0].get('rows', [])
+        except:
+            print(f"   ⚠️ No data or parsing error")
+            return results
+
+    for table_type, count in rows:
+        results[table_type] = count
+        print(f"   ✅ {table_type}: {count} records")
+
+    if not rows:
+        print(f"   ⚠️ No records in the last hour")
+
+    try:
+        cache_path.write_text(json.dumps(results))
+    except OSError:
+        pass  # caching is best-effort
 
     return results
 
+# Dashboard tile constants, defined once at module scope: each KQL is
+# referenced from two places per tile (inputs and settings), so both
+# point at a single interned string instead of duplicated literals
+WORKSPACE_RES_ID = (
+    "/subscriptions/2610a706-cf3d-496e-9a5a-3173e855001e"
+    "/resourceGroups/azure-poc/providers"
+    "/Microsoft.OperationalInsights/workspaces/azurepoc-workspace"
+)
+
+RESP_TIME_KQL = textwrap.dedent("""\
+    union
+    (SalesforceEvent_CL | where TimeGenerated > ago(24h) | where isnotempty(responseTime_d) | extend API_System = "Salesforce", ResponseTime = responseTime_d),
+    (MuleSoftPerformance_CL | where TimeGenerated > ago(24h) | where isnotempty(responseTime_d) | extend API_System = "MuleSoft", ResponseTime = responseTime_d)
+    | summarize AvgResponseTime = avg(ResponseTime) by API_System, bin(TimeGenerated, 1h)
+    | render timechart""")
+
+ERROR_RATE_KQL = textwrap.dedent("""\
+    union
+    (SalesforceEvent_CL | where TimeGenerated > ago(24h) | extend API_System = "Salesforce", IsError = case(statusCode_d >= 400, 1, Success_b == false, 1, 0)),
+    (MuleSoftError_CL | where TimeGenerated > ago(24h) | extend API_System = "MuleSoft", IsError = 1),
+    (MuleSoftPerformance_CL | where TimeGenerated > ago(24h) | extend API_System = "MuleSoft", IsError = case(statusCode_d >= 400, 1, 0))
+    | summarize TotalRequests = count(), ErrorCount = sum(IsError), ErrorRate = (sum(IsError) * 100.0) / count() by API_System, bin(TimeGenerated, 1h)
+    | render timechart""")
+
+# Pre-rendered dashboard JSON shipped next to this script; the tile
+# structure is static, so emitting the config is a placeholder
+# substitution rather than nested-dict construction plus JSON encoding
+_TEMPLATE_PATH = Path(__file__).resolve().parent / "dashboard_template.json"
+
+def render_dashboard_config() -> str:
+    """Render the dashboard config JSON from the shipped template."""
+    template = string.Template(_TEMPLATE_PATH.read_text())
+    return template.substitute(workspace_res_id=WORKSPACE_RES_ID)
+
 def generate_dashboard_json():
     """Generate a working dashboard JSON configuration"""
 
-    workspace_id = "7208379a-ae11-4c06-bb1c-a8fc4d0c34b4"
-
     dashboard_config = {
         "properties": {
             "lenses": [
@@ -83,16 +227,12 @@ def generate_dashboard_json():
                                     {
                                         "name": "ComponentId",
                                         "value": {
-                                            "workspaceResourceId": f"/subscriptions/2610a706-cf3d-496e-9a5a-3173e855001e/resourceGroups/azure-poc/providers/Microsoft.OperationalInsights/workspaces/azurepoc-workspace"
+                                            "workspaceResourceId": WORKSPACE_RES_ID
                                         }
                                     },
                                     {
                                         "name": "Query",
-                                        "value": f"""union
-(SalesforceEvent_CL | where TimeGenerated > ago(24h) | where isnotempty(responseTime_d) | extend API_System = "Salesforce", ResponseTime = responseTime_d),
-(MuleSoftPerformance_CL | where TimeGenerated > ago(24h) | where isnotempty(responseTime_d) | extend API_System = "MuleSoft", ResponseTime = responseTime_d)
-| summarize AvgResponseTime = avg(ResponseTime) by API_System, bin(TimeGenerated, 1h)
-| render timechart"""
+                                        "value": RESP_TIME_KQL
                                     },
                                     {
                                         "name": "TimeRange",
@@ -124,11 +264,7 @@ def generate_dashboard_json():
                                 "type": "Extension/Microsoft_OperationsManagementSuite/PartType/LogsDashboardPart",
                                 "settings": {
                                     "content": {
-                                        "Query": f"""union
-(SalesforceEvent_CL | where TimeGenerated > ago(24h) | where isnotempty(responseTime_d) | extend API_System = "Salesforce", ResponseTime = responseTime_d),
-(MuleSoftPerformance_CL | where TimeGenerated > ago(24h) | where isnotempty(responseTime_d) | extend API_System = "MuleSoft", ResponseTime = responseTime_d)
-| summarize AvgResponseTime = avg(ResponseTime) by API_System, bin(TimeGenerated, 1h)
-| render timechart""",
+                                        "Query": RESP_TIME_KQL,
                                         "ControlType": "AnalyticsChart"
                                     }
                                 }
@@ -145,17 +281,12 @@ def generate_dashboard_json():
                                     {
                                         "name": "ComponentId",
                                         "value": {
-                                            "workspaceResourceId": f"/subscriptions/2610a706-cf3d-496e-9a5a-3173e855001e/resourceGroups/azure-poc/providers/Microsoft.OperationalInsights/workspaces/azurepoc-workspace"
+                                            "workspaceResourceId": WORKSPACE_RES_ID
                                         }
                                     },
                                     {
                                         "name": "Query",
-                                        "value": f"""union
-(SalesforceEvent_CL | where TimeGenerated > ago(24h) | extend API_System = "Salesforce", IsError = case(statusCode_d >= 400, 1, Success_b == false, 1, 0)),
-(MuleSoftError_CL | where TimeGenerated > ago(24h) | extend API_System = "MuleSoft", IsError = 1),
-(MuleSoftPerformance_CL | where TimeGenerated > ago(24h) | extend API_System = "MuleSoft", IsError = case(statusCode_d >= 400, 1, 0))
-| summarize TotalRequests = count(), ErrorCount = sum(IsError), ErrorRate = (sum(IsError) * 100.0) / count() by API_System, bin(TimeGenerated, 1h)
-| render timechart"""
+                                        "value": ERROR_RATE_KQL
                                     },
                                     {
                                         "name": "TimeRange",
@@ -165,12 +296,7 @@ def generate_dashboard_json():
                                 "type": "Extension/Microsoft_OperationsManagementSuite/PartType/LogsDashboardPart",
                                 "settings": {
                                     "content": {
-                                        "Query": f"""union
-(SalesforceEvent_CL | where TimeGenerated > ago(24h) | extend API_System = "Salesforce", IsError = case(statusCode_d >= 400, 1, Success_b == false, 1, 0)),
-(MuleSoftError_CL | where TimeGenerated > ago(24h) | extend API_System = "MuleSoft", IsError = 1),
-(MuleSoftPerformance_CL | where TimeGenerated > ago(24h) | extend API_System = "MuleSoft", IsError = case(statusCode_d >= 400, 1, 0))
-| summarize TotalRequests = count(), ErrorCount = sum(IsError), ErrorRate = (sum(IsError) * 100.0) / count() by API_System, bin(TimeGenerated, 1h)
-| render timechart""",
+                                        "Query": ERROR_RATE_KQL,
                                         "ControlType": "AnalyticsChart"
                                     }
                                 }
@@ -274,10 +400,19 @@ def main():
 
     # Generate updated dashboard config for manual creation
     print(f"\n💾 Creating dashboard configuration...")
-    config = generate_dashboard_json()
 
     with open("dashboard_config.json", "w") as f:
-        json.dump(config, f, indent=2)
+        if _TEMPLATE_PATH.exists():
+            f.write(render_dashboard_config())
+        elif orjson is not None:
+            f.write(orjson.dumps(generate_dashboard_json(),
+                                 option=orjson.OPT_INDENT_2).decode())
+        else:
+            # iterencode writes the document incrementally, so peak
+            # memory stays at O(nesting depth) rather than the full
+            # serialized string json.dump would build first
+            f.writelines(json.JSONEncoder(indent=2).iterencode(
+                generate_dashboard_json()))
 
     print("✅ Dashboard configuration saved to: dashboard_config.json")
     print("   Use this if manual dashboard recreation is needed")
@@ -6,20 +6,76 @@ Generates comprehensive test data specifically for dashboard visualization
 
 import sys
 import os
-import time
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import random
 import uuid
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from api_simulator import MultiAPIEventSimulator
 
-def generate_response_time_data(simulator):
-    """Generate events with varying response times for response time dashboard"""
-    print("📊 Generating Response Time Test Data...")
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # falls back to sequential sends over the simulator session
+
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    AsyncLimiter = None  # rate is then bounded by the semaphore alone
+
+# Cap on concurrent in-flight POSTs; the function app applies its own
+# backpressure beyond this
+_SEM_LIMIT = 64
 
-    events_generated = 0
+# Sustained events/second across all generators; a token bucket allows
+# short bursts while keeping the average at the function app's quota
+_MAX_RATE = 100
+
+async def _send(session, url, event):
+    """POST one event over the shared aiohttp session"""
+    try:
+        async with session.post(url, json=event,
+                                timeout=aiohttp.ClientTimeout(total=10)) as response:
+            return response.status in (200, 202)
+    except Exception as e:
+        print(f"   Error sending event: {str(e)}")
+        return False
+
+async def _dispatch(simulator, session, semaphore, events, limiter=None):
+    """Fire a prepared (endpoint, event) list concurrently; returns successes"""
+    async def throttled(endpoint, event):
+        url = f"{simulator.function_base_url}/api/{endpoint}"
+        async with semaphore:
+            if limiter is not None:
+                async with limiter:
+                    return await _send(session, url, event)
+            return await _send(session, url, event)
+
+    results = await asyncio.gather(
+        *(throttled(endpoint, event) for endpoint, event in events))
+    return sum(results)
+
+def _dispatch_sync(simulator, events):
+    """Sequential fallback used when aiohttp is unavailable"""
+    return sum(
+        1 for endpoint, event in events if simulator.send_event(event, endpoint))
+
+def _stamp_events(events):
+    """Stamp a batch with distinct timestamps from one wall-clock read.
+
+    The whole batch is built at effectively the same instant, so one
+    base datetime plus a per-event microsecond offset replaces a
+    gettimeofday call per event while keeping the timestamps unique.
+    """
+    ts_base = datetime.utcnow().replace(microsecond=0)
+    for i, (_, event) in enumerate(events):
+        event['timestamp'] = (ts_base + timedelta(microseconds=i)).isoformat() + "Z"
+
+def build_response_time_events(simulator):
+    """Construct the response-time event list without touching the network"""
+    events = []
 
     # Salesforce events with different response time patterns
     salesforce_scenarios = [
@@ -34,13 +90,10 @@ def generate_response_time_data(simulator):
     ]
 
     for min_time, max_time, count in salesforce_scenarios:
-        for _ in range(count):
-            event = simulator.generate_sf_api_event()
+        for event in simulator.generate_sf_api_events(count):
             event['ResponseTime_d'] = random.randint(min_time, max_time)
             event['responseTime'] = event['ResponseTime_d']  # Backup field
-            simulator.send_event(event, "salesforceloghandler")
-            events_generated += 1
-            time.sleep(0.2)  # Small delay
+            events.append(("salesforceloghandler", event))
 
     # MuleSoft events with performance patterns
     mulesoft_scenarios = [
@@ -55,28 +108,21 @@ def generate_response_time_data(simulator):
     ]
 
     for min_time, max_time, count in mulesoft_scenarios:
-        for _ in range(count):
-            event = simulator.generate_mulesoft_performance_event()
+        for event in simulator.generate_mulesoft_performance_events(count):
             event['responseTime'] = random.randint(min_time, max_time)
             event['ResponseTime_d'] = event['responseTime']  # Backup field
-            simulator.send_event(event, "mulesoftloghandler")
-            events_generated += 1
-            time.sleep(0.2)  # Small delay
+            events.append(("mulesoftloghandler", event))
 
-    print(f"✅ Generated {events_generated} response time events")
-    return events_generated
-
-def generate_error_rate_data(simulator):
-    """Generate events with error patterns for error rate dashboard"""
-    print("🚨 Generating Error Rate Test Data...")
+    _stamp_events(events)
+    return events
 
-    events_generated = 0
+def build_error_rate_events(simulator):
+    """Construct the error-rate event list without touching the network"""
+    events = []
 
     # Salesforce success and error patterns
     # Generate 80% success, 20% errors for Salesforce
-    for _ in range(40):  # 40 total Salesforce events
-        event = simulator.generate_sf_api_event()
-
+    for event in simulator.generate_sf_api_events(40):  # 40 total Salesforce events
         if random.random() < 0.8:  # 80% success
             event['statusCode'] = random.choices([200, 201, 204], weights=[70, 20, 10])[0]
             event['success'] = True
@@ -88,15 +134,11 @@ def generate_error_rate_data(simulator):
         event['StatusCode_d'] = event['statusCode']
         event['Success_b'] = event['success']
 
-        simulator.send_event(event, "salesforceloghandler")
-        events_generated += 1
-        time.sleep(0.1)
+        events.append(("salesforceloghandler", event))
 
     # MuleSoft success and error patterns
     # Generate 85% success, 15% errors for MuleSoft
-    for _ in range(30):  # 30 MuleSoft performance events
-        event = simulator.generate_mulesoft_performance_event()
-
+    for event in simulator.generate_mulesoft_performance_events(30):  # 30 MuleSoft performance events
         if random.random() < 0.85:  # 85% success
             event['statusCode'] = random.choices([200, 201, 202], weights=[80, 15, 5])[0]
             event['success'] = True
@@ -108,41 +150,40 @@ def generate_error_rate_data(simulator):
         event['StatusCode_d'] = event['statusCode']
         event['Success_b'] = event['success']
 
-        simulator.send_event(event, "mulesoftloghandler")
-        events_generated += 1
-        time.sleep(0.1)
+        events.append(("mulesoftloghandler", event))
 
     # Generate dedicated MuleSoft error events
-    for _ in range(15):  # 15 explicit error events
-        event = simulator.generate_mulesoft_error_event()
-        simulator.send_event(event, "mulesoftloghandler")
-        events_generated += 1
-        time.sleep(0.1)
-
-    print(f"✅ Generated {events_generated} error rate events")
-    return events_generated
+    events.extend(("mulesoftloghandler", event)
+                  for event in simulator.generate_mulesoft_error_events(15))
 
-def generate_time_series_data(simulator):
-    """Generate events spread over time for time-series dashboard testing"""
-    print("📈 Generating Time-Series Data...")
+    _stamp_events(events)
+    return events
 
-    events_generated = 0
+def build_time_series_events(simulator):
+    """Construct the time-series event list without touching the network"""
+    events = []
 
     # Generate events for the last few hours (simulated)
     base_time = datetime.utcnow()
 
     for hour_offset in range(-4, 1):  # Last 4 hours + current
-        for _ in range(15):  # 15 events per hour
-            # Alternate between systems
-            if random.random() < 0.6:  # 60% MuleSoft, 40% Salesforce
-                event = simulator.generate_mulesoft_performance_event()
-                endpoint = "mulesoftloghandler"
-            else:
-                event = simulator.generate_sf_api_event()
-                endpoint = "salesforceloghandler"
-
+        # 60% MuleSoft, 40% Salesforce out of 15 events per hour, with
+        # each system's share generated off one batched pool refill
+        mulesoft_count = sum(1 for _ in range(15) if random.random() < 0.6)
+        hour_events = [
+            ("mulesoftloghandler", event)
+            for event in simulator.generate_mulesoft_performance_events(mulesoft_count)
+        ] + [
+            ("salesforceloghandler", event)
+            for event in simulator.generate_sf_api_events(15 - mulesoft_count)
+        ]
+
+        # Hoist the per-hour base so only the minute offset varies per event
+        hour_base = base_time + timedelta(hours=hour_offset)
+
+        for endpoint, event in hour_events:
             # Adjust timestamp to simulate historical data
-            event_time = base_time + timedelta(hours=hour_offset, minutes=random.randint(0, 59))
+            event_time = hour_base + timedelta(minutes=random.randint(0, 59))
             event['timestamp'] = event_time.isoformat() + "Z"
 
             # Add response time data
@@ -160,18 +201,82 @@ def generate_time_series_data(simulator):
             event['StatusCode_d'] = event['statusCode']
             event['Success_b'] = event['success']
 
-            simulator.send_event(event, endpoint)
-            events_generated += 1
-            time.sleep(0.05)  # Very small delay
+            events.append((endpoint, event))
+
+    return events
 
-    print(f"✅ Generated {events_generated} time-series events")
-    return events_generated
+async def generate_response_time_data_async(simulator, session, semaphore, limiter=None):
+    """Generate events with varying response times for response time dashboard"""
+    print("📊 Generating Response Time Test Data...")
+    events = build_response_time_events(simulator)
+    await _dispatch(simulator, session, semaphore, events, limiter)
+    print(f"✅ Generated {len(events)} response time events")
+    return len(events)
+
+async def generate_error_rate_data_async(simulator, session, semaphore, limiter=None):
+    """Generate events with error patterns for error rate dashboard"""
+    print("🚨 Generating Error Rate Test Data...")
+    events = build_error_rate_events(simulator)
+    await _dispatch(simulator, session, semaphore, events, limiter)
+    print(f"✅ Generated {len(events)} error rate events")
+    return len(events)
+
+async def generate_time_series_data_async(simulator, session, semaphore, limiter=None):
+    """Generate events spread over time for time-series dashboard testing"""
+    print("📈 Generating Time-Series Data...")
+    events = build_time_series_events(simulator)
+    await _dispatch(simulator, session, semaphore, events, limiter)
+    print(f"✅ Generated {len(events)} time-series events")
+    return len(events)
+
+def generate_response_time_data(simulator):
+    """Sequential fallback for response time data when aiohttp is unavailable"""
+    print("📊 Generating Response Time Test Data...")
+    events = build_response_time_events(simulator)
+    _dispatch_sync(simulator, events)
+    print(f"✅ Generated {len(events)} response time events")
+    return len(events)
+
+def generate_error_rate_data(simulator):
+    """Sequential fallback for error rate data when aiohttp is unavailable"""
+    print("🚨 Generating Error Rate Test Data...")
+    events = build_error_rate_events(simulator)
+    _dispatch_sync(simulator, events)
+    print(f"✅ Generated {len(events)} error rate events")
+    return len(events)
+
+def generate_time_series_data(simulator):
+    """Sequential fallback for time-series data when aiohttp is unavailable"""
+    print("📈 Generating Time-Series Data...")
+    events = build_time_series_events(simulator)
+    _dispatch_sync(simulator, events)
+    print(f"✅ Generated {len(events)} time-series events")
+    return len(events)
+
+async def main_async(simulator):
+    """Run the three generators over one shared session, semaphore and limiter"""
+    semaphore = asyncio.Semaphore(_SEM_LIMIT)
+    limiter = (AsyncLimiter(max_rate=_MAX_RATE, time_period=1)
+               if AsyncLimiter is not None else None)
+    connector = aiohttp.TCPConnector(limit=_SEM_LIMIT, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # The three generators are independent, so let them share the
+        # connection pool and rate budget concurrently
+        counts = await asyncio.gather(
+            generate_response_time_data_async(simulator, session, semaphore, limiter),
+            generate_error_rate_data_async(simulator, session, semaphore, limiter),
+            generate_time_series_data_async(simulator, session, semaphore, limiter))
+    return sum(counts)
 
 def main():
     """Main dashboard data generation"""
     print("🎨 Dashboard Test Data Generator")
     print("=" * 60)
 
+    # Imported here so the simulator stack (requests and friends) only
+    # loads when data generation actually runs
+    from api_simulator import MultiAPIEventSimulator
+
     # Initialize simulator
     function_url = "https://azurepoc-function-app.azurewebsites.net"
     simulator = MultiAPIEventSimulator(function_url)
@@ -183,14 +288,19 @@ def main():
     total_events = 0
 
     try:
-        # Generate different types of test data
-        total_events += generate_response_time_data(simulator)
-        time.sleep(2)  # Pause between generations
-
-        total_events += generate_error_rate_data(simulator)
-        time.sleep(2)  # Pause between generations
-
-        total_events += generate_time_series_data(simulator)
+        # Generate different types of test data; all events are built
+        # up-front and fired concurrently when aiohttp is available
+        if aiohttp is not None:
+            total_events = asyncio.run(main_async(simulator))
+        else:
+            # Even with synchronous sends the three generators are
+            # HTTP-bound and independent, so overlap them in threads
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [executor.submit(fn, simulator)
+                           for fn in (generate_response_time_data,
+                                      generate_error_rate_data,
+                                      generate_time_series_data)]
+                total_events = sum(future.result() for future in futures)
 
         print("\n" + "=" * 60)
         print("🎉 Dashboard Data Generation Complete!")